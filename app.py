@@ -2,17 +2,42 @@ import pandas as pd
 import glob
 import os
 import re
-from quart import Quart, request, jsonify, render_template, send_from_directory
+from quart import Quart, request, jsonify, render_template, send_from_directory, make_response
 import graphene
 import asyncio
 import traceback
 import csv
 import numpy as np
+import json
+import time
+import inspect
+from graphql import GraphQLError, parse, validate, execute
+from graphql.language import OperationDefinitionNode, FieldNode
+import metrics
+from search_index import SearchIndex
+
+RESULTS_DIR = os.getenv('RESULTS_DIR', 'results')
+RESULTS_POLL_INTERVAL = float(os.getenv('RESULTS_POLL_INTERVAL', '2'))
+LIVE_KEEPALIVE_INTERVAL = 15
+LIVE_QUEUE_SIZE = 100
+# Queued instead of an update when a subscriber's queue overflows
+LIVE_RESYNC = None
+USE_STATIC_BUNDLES = os.getenv('USE_STATIC_BUNDLES', '').lower() in ('1', 'true', 'yes')
+# GraphQL requests slower than this are logged with their document, 0 disables the log
+SLOW_QUERY_SECONDS = float(os.getenv('SLOW_QUERY_MS', '0')) / 1000
 
 df = None
 schema = None
 data_loaded_event = asyncio.Event()
 
+# Live updates: modification times of the loaded result files and the
+# subscriber queues of /api/live, keyed by queue with their filter as value.
+result_mtimes = {}
+live_subscribers = {}
+
+metrics.DATA_LOADED.set(0)
+metrics.LIVE_SUBSCRIBERS.set(0)
+
 def clean_source_file_name(file_name: str) -> str:
     """
     Cleans up a source file name by removing the prefix, extension, and underscores,
@@ -24,52 +49,46 @@ def clean_source_file_name(file_name: str) -> str:
     cleaned_name = cleaned_name.replace('_', ' ')
     return cleaned_name.strip()
 
-def load_all_csvs(folder_path: str) -> pd.DataFrame:
-    all_files = glob.glob(os.path.join(folder_path, "*.csv"))
-    print("Loading CSV files:", all_files)
-    df_list = []
-
-    standard_columns = [
-        'Merkmal',
-        'Erststimmen_Anzahl',
-        'Erststimmen_Anteil',
-        'Erststimmen_Gewinn',
-        'Zweitstimmen_Anzahl',
-        'Zweitstimmen_Anteil',
-        'Zweitstimmen_Gewinn'
-    ]
-
-    for file in all_files:
-        try:
-            temp_df = pd.read_csv(file, sep=';', on_bad_lines='skip')
-            temp_df.columns = standard_columns
+STANDARD_COLUMNS = [
+    'Merkmal',
+    'Erststimmen_Anzahl',
+    'Erststimmen_Anteil',
+    'Erststimmen_Gewinn',
+    'Zweitstimmen_Anzahl',
+    'Zweitstimmen_Anteil',
+    'Zweitstimmen_Gewinn'
+]
+
+def load_csv_file(file: str) -> pd.DataFrame:
+    """
+    Parses a single scraped results CSV into the normalized row format
+    used by the GraphQL schema.
+    """
+    temp_df = pd.read_csv(file, sep=';', on_bad_lines='skip')
+    temp_df.columns = STANDARD_COLUMNS
 
-            temp_df = temp_df.apply(lambda x: x.astype(str).str.replace(',', '.', regex=False).str.replace('%', '', regex=False) if x.name != 'Merkmal' else x)
-            temp_df[standard_columns[1:]] = temp_df[standard_columns[1:]].apply(pd.to_numeric, errors='coerce')
+    temp_df = temp_df.apply(lambda x: x.astype(str).str.replace(',', '.', regex=False).str.replace('%', '', regex=False) if x.name != 'Merkmal' else x)
+    temp_df[STANDARD_COLUMNS[1:]] = temp_df[STANDARD_COLUMNS[1:]].apply(pd.to_numeric, errors='coerce')
 
-            base_name = os.path.basename(file)
+    base_name = os.path.basename(file)
 
-            # Extract electoral type and IDs using a more flexible regex
-            electoral_match = re.search(r'^([a-z]+)_(\d+)_(\d+)', base_name)
+    # Extract electoral type and IDs using a more flexible regex
+    electoral_match = re.search(r'^([a-z]+)_(\d+)_(\d+)', base_name)
 
-            electoral_type = electoral_match.group(1) if electoral_match else None
-            wahlkreis_id = electoral_match.group(2) if electoral_match else None
-            specific_id = electoral_match.group(3) if electoral_match else None
+    electoral_type = electoral_match.group(1) if electoral_match else None
+    wahlkreis_id = electoral_match.group(2) if electoral_match else None
+    specific_id = electoral_match.group(3) if electoral_match else None
 
-            # Keep the original 'districtId' column name but now with the new 'specificId'
-            # Also add new columns for the wahlkreisId and sourceType
-            temp_df['districtId'] = specific_id if specific_id else None
-            temp_df['wahlkreisId'] = f"wk{wahlkreis_id}" if wahlkreis_id else None
-            temp_df['sourceType'] = electoral_type
-            temp_df['locationName'] = clean_source_file_name(base_name)
-            temp_df['sourceFile'] = base_name
-
-            df_list.append(temp_df)
-        except Exception as e:
-            print(f"Error reading and processing file {file}: {e}")
-            traceback.print_exc()
-            continue
+    # Keep the original 'districtId' column name but now with the new 'specificId'
+    # Also add new columns for the wahlkreisId and sourceType
+    temp_df['districtId'] = specific_id if specific_id else None
+    temp_df['wahlkreisId'] = f"wk{wahlkreis_id}" if wahlkreis_id else None
+    temp_df['sourceType'] = electoral_type
+    temp_df['locationName'] = clean_source_file_name(base_name)
+    temp_df['sourceFile'] = base_name
+    return temp_df
 
+def concat_results(df_list: list) -> pd.DataFrame:
     if not df_list:
         return pd.DataFrame()
 
@@ -78,6 +97,28 @@ def load_all_csvs(folder_path: str) -> pd.DataFrame:
     for col in df.columns:
         if pd.api.types.is_numeric_dtype(df[col]):
             df[col] = df[col].fillna(0)
+    return df
+
+def load_all_csvs(folder_path: str) -> pd.DataFrame:
+    with metrics.timed(metrics.INGEST_STAGE_SECONDS, stage='glob'):
+        all_files = glob.glob(os.path.join(folder_path, "*.csv"))
+    print(f"Loading {len(all_files)} CSV files from '{folder_path}'...")
+    df_list = []
+
+    with metrics.timed(metrics.INGEST_STAGE_SECONDS, stage='parse'):
+        for file in all_files:
+            try:
+                df_list.append(load_csv_file(file))
+            except Exception as e:
+                print(f"Error reading and processing file {file}: {e}")
+                traceback.print_exc()
+                metrics.INGEST_FILE_ERRORS.inc()
+                continue
+
+    with metrics.timed(metrics.INGEST_STAGE_SECONDS, stage='concat'):
+        df = concat_results(df_list)
+    if df.empty:
+        return df
 
     print("DataFrame loaded with columns:", df.columns.tolist())
     return df
@@ -109,10 +150,20 @@ def create_graphql_type(df: pd.DataFrame) -> graphene.ObjectType:
 
     return type('CsvType', (graphene.ObjectType,), attrs)
 
+class SearchSuggestion(graphene.ObjectType):
+    label = graphene.String()
+    kind = graphene.String(description="'location' or 'party'")
+    score = graphene.Float()
+    districtIds = graphene.List(graphene.String, description="The first districtIds of the suggestion")
+    districtCount = graphene.Int(description="Number of districtIds of the suggestion")
+
 def create_schema_from_df(df: pd.DataFrame):
+    with metrics.timed(metrics.INGEST_STAGE_SECONDS, stage='schema'):
+        build_schema(df)
+
+def build_schema(df: pd.DataFrame):
     global schema
-    print("DataFrame columns before schema creation:", df.columns.tolist())
-    print("DataFrame head:\n", df.head())
+    print(f"Creating schema for {len(df)} rows with columns:", df.columns.tolist())
     if df.empty or not len(df.columns):
         print("DataFrame is empty or has no columns, using EmptyQuery.")
         class EmptyQuery(graphene.ObjectType):
@@ -122,12 +173,24 @@ def create_schema_from_df(df: pd.DataFrame):
         schema = graphene.Schema(query=EmptyQuery)
         return
     CsvType = create_graphql_type(df)
+    search_index = SearchIndex(df)
 
     class Query(graphene.ObjectType):
         allData = graphene.List(
             CsvType,
             **{col: graphene.String(description=f"Filter by {col}") for col in df.columns}
         )
+        search = graphene.List(
+            SearchSuggestion,
+            term=graphene.String(required=True, description="Prefix or misspelled location name or party"),
+            limit=graphene.Int(default_value=10, description="Maximum number of suggestions")
+        )
+
+        def resolve_search(self, info, term, limit):
+            suggestions = search_index.search(term, limit)
+            metrics.RESOLVER_ROWS.observe(len(suggestions), resolver='search')
+            return suggestions
+
         async def resolve_allData(self, info, **kwargs):
             await asyncio.sleep(0.01)
             results = df.copy()
@@ -138,21 +201,203 @@ def create_schema_from_df(df: pd.DataFrame):
             records = results.to_dict('records')
 
             if isinstance(records, dict):
-                return [records]
+                records = [records]
 
+            metrics.RESOLVER_ROWS.observe(len(records), resolver='allData')
             return records
     schema = graphene.Schema(query=Query)
 
+LIVE_FILTERS = ['districtId', 'wahlkreisId', 'party']
+COUNT_COLUMNS = ['Erststimmen_Anzahl', 'Zweitstimmen_Anzahl']
+
+def snapshot_mtimes(folder_path: str) -> dict:
+    """
+    Returns the modification time of every results CSV, keyed by file name.
+    """
+    mtimes = {}
+    for file in glob.glob(os.path.join(folder_path, "*.csv")):
+        try:
+            mtimes[os.path.basename(file)] = os.stat(file).st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return mtimes
+
+def diff_results(old_rows: pd.DataFrame, new_rows: pd.DataFrame) -> dict:
+    """
+    Compares the rows of the changed source files before and after an update.
+    Returns the new rows whose values changed and the vote deltas per
+    wahlkreisId and Merkmal.
+    """
+    numeric_columns = STANDARD_COLUMNS[1:]
+    keys = ['sourceFile', 'Merkmal']
+
+    if new_rows.empty or old_rows.empty:
+        changed = new_rows
+    else:
+        # A file can list the same Merkmal twice, keep one old row per key so the merge stays aligned with new_rows
+        previous = old_rows[keys + numeric_columns].drop_duplicates(keys, keep='last')
+        merged = new_rows.merge(previous, on=keys, how='left', suffixes=('', '_old'))
+        differs = np.zeros(len(merged), dtype=bool)
+        for col in numeric_columns:
+            differs |= (merged[col] != merged[f"{col}_old"]).to_numpy()
+        changed = new_rows[differs]
+
+    def totals(rows):
+        if rows.empty:
+            index = pd.MultiIndex.from_tuples([], names=['wahlkreisId', 'Merkmal'])
+            return pd.DataFrame(columns=COUNT_COLUMNS, index=index, dtype=float)
+        return rows.groupby(['wahlkreisId', 'Merkmal'])[COUNT_COLUMNS].sum()
+
+    # Rows of removed files are only in old_rows and count as negative deltas
+    deltas = totals(new_rows).sub(totals(old_rows), fill_value=0)
+    deltas = deltas[(deltas != 0).any(axis=1)].reset_index()
+
+    return {
+        "rows": changed.to_dict('records'),
+        "aggregates": deltas.to_dict('records'),
+    }
+
+def apply_results_update(current_df: pd.DataFrame, changed_files: list, removed_files: list):
+    """
+    Re-parses the changed files, splices them into a copy of the loaded
+    DataFrame and computes the diff that is pushed to live subscribers.
+    Returns the new DataFrame, the update and the files that could be parsed.
+    Runs in a worker thread.
+    """
+    df_list = []
+    parsed_files = []
+    for name in changed_files:
+        try:
+            df_list.append(load_csv_file(os.path.join(RESULTS_DIR, name)))
+            parsed_files.append(name)
+        except Exception as e:
+            # Keep the rows loaded before, the file is read again once it is rewritten
+            print(f"Error reading and processing file {name}: {e}")
+            traceback.print_exc()
+            metrics.INGEST_FILE_ERRORS.inc()
+    new_rows = concat_results(df_list)
+
+    touched = set(parsed_files) | set(removed_files)
+    if current_df is None or current_df.empty:
+        old_rows = pd.DataFrame(columns=new_rows.columns)
+        kept = []
+    else:
+        mask = current_df['sourceFile'].isin(touched)
+        old_rows = current_df[mask]
+        kept = [current_df[~mask]]
+
+    updated_df = concat_results(kept + ([new_rows] if not new_rows.empty else []))
+    update = diff_results(old_rows, new_rows)
+    update["removedFiles"] = sorted(removed_files)
+    return updated_df, update, parsed_files
+
+def filter_update(update: dict, filters: dict):
+    """
+    Narrows a shared update down to one subscription. Rows match on
+    districtId, wahlkreisId and party; aggregates on wahlkreisId and party
+    and are omitted for subscriptions to a single districtId.
+    Returns None if nothing in the update concerns the subscriber.
+    """
+    def matches(item, with_district):
+        if with_district and filters.get('districtId') and item.get('districtId') != filters['districtId']:
+            return False
+        if filters.get('wahlkreisId') and item.get('wahlkreisId') != filters['wahlkreisId']:
+            return False
+        if filters.get('party') and str(item.get('Merkmal', '')).lower() != filters['party'].lower():
+            return False
+        return True
+
+    rows = [row for row in update["rows"] if matches(row, True)]
+    if filters.get('districtId'):
+        aggregates = []
+    else:
+        aggregates = [item for item in update["aggregates"] if matches(item, False)]
+
+    if not rows and not aggregates and not update["removedFiles"]:
+        return None
+    return {"rows": rows, "aggregates": aggregates, "removedFiles": update["removedFiles"]}
+
+def publish_update(update: dict):
+    """
+    Fans an update out to all live subscribers. The payload is filtered and
+    serialized once per distinct subscription, not once per client.
+    """
+    payloads = {}
+    for queue, filters in list(live_subscribers.items()):
+        key = tuple(sorted(filters.items()))
+        if key not in payloads:
+            filtered = filter_update(update, filters)
+            payloads[key] = json.dumps(filtered, ensure_ascii=False, default=str) if filtered else None
+        if payloads[key] is None:
+            continue
+        try:
+            queue.put_nowait(payloads[key])
+        except asyncio.QueueFull:
+            # Its running totals would miss this delta, so replace the backlog with a resync
+            print("Live subscriber is not keeping up, sending resync.")
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(LIVE_RESYNC)
+
+async def watch_results():
+    """
+    Polls the results folder for rewritten files, updates the DataFrame and
+    schema in place and pushes the changes to live subscribers.
+    """
+    global df, result_mtimes
+    await data_loaded_event.wait()
+    while not app.shutdown_event.is_set():
+        try:
+            await asyncio.wait_for(app.shutdown_event.wait(), timeout=RESULTS_POLL_INTERVAL)
+            break
+        except asyncio.TimeoutError:
+            pass
+        current = None
+        try:
+            current = await asyncio.to_thread(snapshot_mtimes, RESULTS_DIR)
+            changed = [name for name, mtime in current.items() if result_mtimes.get(name) != mtime]
+            removed = [name for name in result_mtimes if name not in current]
+            if not changed and not removed:
+                continue
+
+            updated_df, update, parsed_files = await asyncio.to_thread(apply_results_update, df, changed, removed)
+            if not parsed_files and not removed:
+                # Nothing could be parsed, the old rows stay until the files are rewritten
+                result_mtimes = current
+                continue
+            # Build the schema and search index off the event loop, then swap in the new data
+            await asyncio.to_thread(create_schema_from_df, updated_df)
+            df = updated_df
+            result_mtimes = current
+            record_data_metrics(df)
+            print(f"Live update: {len(changed)} changed, {len(removed)} removed result files.")
+            publish_update(update)
+            metrics.LIVE_UPDATES.inc()
+        except Exception as e:
+            print(f"Error while watching results: {e}")
+            traceback.print_exc()
+            # Skip this state of the files instead of failing on it again every poll
+            if current is not None:
+                result_mtimes = current
+
+def record_data_metrics(df: pd.DataFrame):
+    metrics.DATA_ROWS.set(len(df))
+    metrics.DATA_FILES.set(int(df['sourceFile'].nunique()) if 'sourceFile' in df.columns else 0)
+    metrics.DATA_LAST_LOAD.set(time.time())
+
 app = Quart(__name__)
 
 async def load_data_and_create_schema():
-    global df, schema
+    global df, schema, result_mtimes
     print("Starting data loading in background...")
     try:
-        df = await asyncio.to_thread(load_all_csvs, 'results')
-        create_schema_from_df(df)
+        # Snapshot before loading so files rewritten during the load are picked up by the watcher
+        result_mtimes = await asyncio.to_thread(snapshot_mtimes, RESULTS_DIR)
+        df = await asyncio.to_thread(load_all_csvs, RESULTS_DIR)
+        await asyncio.to_thread(create_schema_from_df, df)
+        record_data_metrics(df)
+        metrics.DATA_LOADED.set(1 if schema is not None else 0)
         print("GraphQL schema created successfully!")
-        print("Final DataFrame Columns:", df.columns.tolist())
         print("You can query with these exact field names:")
         for col in df.columns:
             print(f"   {col}")
@@ -162,10 +407,22 @@ async def load_data_and_create_schema():
 @app.before_serving
 async def start_background_task():
     app.add_background_task(load_data_and_create_schema)
+    app.add_background_task(watch_results)
 
 @app.route("/")
 async def index():
-    return await render_template('index.html')
+    return await render_template('index.html', use_static_bundles=USE_STATIC_BUNDLES)
+
+def root_fields(document) -> str:
+    """
+    Returns the top-level fields of a query document, e.g. 'allData', as metrics label.
+    """
+    fields = set()
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            fields.update(selection.name.value for selection in definition.selection_set.selections
+                          if isinstance(selection, FieldNode))
+    return ','.join(sorted(fields))
 
 @app.route("/graphql", methods=["POST"])
 async def graphql_endpoint():
@@ -173,22 +430,69 @@ async def graphql_endpoint():
 
     if schema is None:
         return jsonify({"errors": [{"message": "API not initialized."}]}), 500
+
+    start = time.perf_counter()
+    query = None
+    variables = None
+    field = 'unknown'
+    stage = 'parse'
     try:
         data = await request.get_json()
         query = data.get("query")
         variables = data.get("variables")
 
-        result = await schema.execute_async(query, variable_values=variables)
-
+        # The stages of schema.execute_async, run one by one to time them
         response = {}
-        if result.errors:
-            response["errors"] = [{"message": str(e)} for e in result.errors]
-        if result.data:
-            response["data"] = result.data
-        return jsonify(response)
+        with metrics.timed(metrics.GRAPHQL_STAGE_SECONDS, stage='parse'):
+            try:
+                document = parse(query)
+            except GraphQLError as e:
+                document = None
+                response["errors"] = [{"message": str(e)}]
+
+        if document is not None:
+            stage = 'validate'
+            with metrics.timed(metrics.GRAPHQL_STAGE_SECONDS, stage='validate'):
+                validation_errors = validate(schema.graphql_schema, document)
+            if validation_errors:
+                response["errors"] = [{"message": str(e)} for e in validation_errors]
+            else:
+                field = root_fields(document)
+                stage = 'resolve'
+                with metrics.timed(metrics.GRAPHQL_STAGE_SECONDS, stage='resolve'):
+                    result = execute(schema.graphql_schema, document, variable_values=variables)
+                    if inspect.isawaitable(result):
+                        result = await result
+                if result.errors:
+                    response["errors"] = [{"message": str(e)} for e in result.errors]
+                if result.data:
+                    response["data"] = result.data
+
+        if "errors" in response:
+            metrics.GRAPHQL_ERRORS.inc(stage=stage)
+
+        stage = 'serialize'
+        with metrics.timed(metrics.GRAPHQL_STAGE_SECONDS, stage='serialize'):
+            json_response = jsonify(response)
+        metrics.GRAPHQL_RESPONSE_BYTES.observe(len(await json_response.get_data()), field=field)
+        return json_response
     except Exception as e:
         print(f"GraphQL error: {e}")
+        metrics.GRAPHQL_ERRORS.inc(stage=stage)
         return jsonify({"errors": [{"message": str(e)}]}), 400
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.GRAPHQL_REQUEST_SECONDS.observe(elapsed, field=field)
+        if SLOW_QUERY_SECONDS and elapsed > SLOW_QUERY_SECONDS:
+            print(f"Slow GraphQL query ({elapsed * 1000:.1f} ms): {query} variables={variables}")
+
+@app.route("/metrics")
+async def metrics_endpoint():
+    """
+    Returns ingestion, request, resolver and live update metrics in the
+    Prometheus text format.
+    """
+    return metrics.render_all(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
 
 @app.route("/api/polling-places")
 async def get_polling_places():
@@ -205,6 +509,42 @@ async def get_polling_places():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/live")
+async def live_results():
+    """
+    Server-Sent Events stream of result changes. Subscribe with any of the
+    query parameters districtId, wahlkreisId and party.
+    """
+    filters = {key: request.args[key] for key in LIVE_FILTERS if request.args.get(key)}
+    queue = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+
+    async def event_stream():
+        live_subscribers[queue] = filters
+        metrics.LIVE_SUBSCRIBERS.set(len(live_subscribers))
+        try:
+            yield f"event: subscribed\ndata: {json.dumps(filters, ensure_ascii=False)}\n\n".encode('utf-8')
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if payload is LIVE_RESYNC:
+                    yield b"event: resync\ndata: {}\n\n"
+                    continue
+                yield f"event: update\ndata: {payload}\n\n".encode('utf-8')
+        finally:
+            live_subscribers.pop(queue, None)
+            metrics.LIVE_SUBSCRIBERS.set(len(live_subscribers))
+
+    response = await make_response(event_stream(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    response.timeout = None
+    return response
+
 @app.route("/static/<path:filename>")
 async def static_files(filename):
     # Add a case here to redirect favicon.ico to the SVG file.
@@ -0,0 +1,128 @@
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """
+    Base class of the metrics; values are kept per combination of label values.
+    """
+    kind = None
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, '') for name in self.label_names)
+
+    def samples(self):
+        for key, value in sorted(self.values.items()):
+            yield self.name, format_labels(self.label_names, key), value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            lines += [f"{name}{labels} {format_value(value)}" for name, labels, value in self.samples()]
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        super().__init__(name, help_text, labels)
+        if not self.label_names:
+            self.values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self.key(labels)] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * len(self.buckets), 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+    def samples(self):
+        for key, (counts, total) in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", format_labels(self.label_names, key, [('le', format_value(bound))]), count
+            yield f"{self.name}_sum", format_labels(self.label_names, key), total
+            yield f"{self.name}_count", format_labels(self.label_names, key), counts[-1]
+
+@contextmanager
+def timed(metric, **labels):
+    """
+    Records the duration of the block in seconds, on a Histogram or a Gauge.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if isinstance(metric, Histogram):
+            metric.observe(elapsed, **labels)
+        else:
+            metric.set(elapsed, **labels)
+
+REGISTRY = []
+
+def render_all() -> str:
+    """
+    Returns every registered metric in the Prometheus text exposition format.
+    """
+    return '\n'.join(metric.render() for metric in REGISTRY) + '\n'
+
+INGEST_STAGE_SECONDS = Gauge('rosa_ingest_stage_seconds', 'Duration of the stages of the last data load.', ['stage'])
+INGEST_FILE_ERRORS = Counter('rosa_ingest_file_errors_total', 'Result files that could not be parsed.')
+DATA_LOADED = Gauge('rosa_data_loaded', 'Whether the results are loaded and the schema is ready (1) or not (0).')
+DATA_ROWS = Gauge('rosa_data_rows', 'Rows in the loaded results DataFrame.')
+DATA_FILES = Gauge('rosa_data_files', 'Result files in the loaded results DataFrame.')
+DATA_LAST_LOAD = Gauge('rosa_data_last_load_timestamp_seconds', 'Unix time of the last data load or live update.')
+
+GRAPHQL_REQUEST_SECONDS = Histogram('rosa_graphql_request_seconds', 'Latency of /graphql requests.', ['field'])
+GRAPHQL_STAGE_SECONDS = Histogram('rosa_graphql_stage_seconds', 'Latency of the stages of /graphql requests.', ['stage'])
+GRAPHQL_ERRORS = Counter('rosa_graphql_errors_total', 'Failed /graphql requests by stage.', ['stage'])
+GRAPHQL_RESPONSE_BYTES = Histogram('rosa_graphql_response_bytes', 'Size of /graphql responses.', ['field'], BYTE_BUCKETS)
+RESOLVER_ROWS = Histogram('rosa_resolver_rows', 'Rows returned per resolver call.', ['resolver'], ROW_BUCKETS)
+
+LIVE_SUBSCRIBERS = Gauge('rosa_live_subscribers', 'Open /api/live subscriptions.')
+LIVE_UPDATES = Counter('rosa_live_updates_total', 'Result updates pushed to live subscribers.')
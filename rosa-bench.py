@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import time
+import app
+
+# The queries script.js sends to /graphql
+DISTRICT_QUERY = """
+query GetPollingPlaceData($districtId: String!) {
+    allData(districtId: $districtId) {
+        Merkmal ErststimmenAnzahl ErststimmenAnteil ErststimmenGewinn
+        ZweitstimmenAnzahl ZweitstimmenAnteil ZweitstimmenGewinn
+        districtId wahlkreisId sourceType sourceFile
+    }
+}
+"""
+WAHLKREIS_QUERY = """
+query GetWahlkreisData($wahlkreisId: String!) {
+    allData(wahlkreisId: $wahlkreisId) {
+        Merkmal ErststimmenAnzahl ZweitstimmenAnzahl districtId
+    }
+}
+"""
+MERKMAL_QUERY = """
+query GetData($merkmal: String) {
+    allData(Merkmal: $merkmal) {
+        Merkmal ErststimmenAnzahl ZweitstimmenAnzahl districtId wahlkreisId sourceType sourceFile
+    }
+}
+"""
+
+def summarize(name: str, timings: list) -> dict:
+    result = {
+        "name": name,
+        "repeat": len(timings),
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3)
+    }
+    print(f"{name:<40} {result['min_ms']:>10.3f} {result['median_ms']:>10.3f} {result['mean_ms']:>10.3f}")
+    return result
+
+def measure(name: str, func, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(name, timings)
+
+async def measure_async(name: str, func, repeat: int) -> dict:
+    """
+    Like measure, for coroutine functions. All iterations share the running
+    event loop, so loop setup is not part of the timings.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(name, timings)
+
+def load_rosa_rain():
+    """
+    Imports rosa-rain.py, which needs CairoSVG and the cairo library.
+    Returns None if either is missing.
+    """
+    spec = importlib.util.spec_from_file_location('rosa_rain', 'rosa-rain.py')
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except (ImportError, OSError) as e:
+        print(f"Skipping render benchmarks: {e}")
+        return None
+    return module
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+async def run_query(query: str, variables: dict):
+    result = await app.schema.execute_async(query, variable_values=variables)
+    if result.errors:
+        raise RuntimeError(result.errors)
+
+async def benchmark_requests(queries: list, repeat: int) -> list:
+    """
+    Times the resolvers directly and through the endpoints of the test client.
+    """
+    results = []
+    for name, query, variables in queries:
+        results.append(await measure_async(name, lambda: run_query(query, variables), repeat))
+
+    client = app.app.test_client()
+
+    async def post_graphql(query, variables):
+        response = await client.post('/graphql', json={"query": query, "variables": variables})
+        await response.get_data()
+
+    for name, query, variables in queries:
+        results.append(await measure_async(f"POST /graphql {name}", lambda: post_graphql(query, variables), repeat))
+
+    async def get_polling_places():
+        response = await client.get('/api/polling-places')
+        await response.get_data()
+
+    # Lists static/data/locations, so it does not grow with --folder
+    results.append(await measure_async('GET /api/polling-places', get_polling_places, repeat))
+    return results
+
+def benchmark_rendering(df, folder_path: str, render_files: int, repeat: int) -> list:
+    """
+    Times rendering the first result files into rr.svg and on to PDF.
+    """
+    rosa_rain = load_rosa_rain()
+    if rosa_rain is None:
+        return []
+    with open('rr.svg', 'r', encoding='utf-8') as f:
+        svg_doc = f.read()
+    match = rosa_rain.TABLE_LAYER_PATTERN.search(svg_doc)
+    if not match:
+        print("Skipping render benchmarks: the ElectionTable layer was not found in rr.svg.")
+        return []
+
+    csv_files = sorted(df['sourceFile'].unique())[:render_files]
+    csv_strings = {}
+    for filename in csv_files:
+        with open(os.path.join(folder_path, filename), 'r', encoding='utf-8') as f:
+            csv_strings[filename] = f.read()
+
+    def render(to_pdf):
+        for filename, csv_string in csv_strings.items():
+            svg_table = rosa_rain.csv_to_svg_table(csv_string, filename)
+            new_svg_doc = rosa_rain.TABLE_LAYER_PATTERN.sub(f'{match.group(1)}\n{svg_table}\n{match.group(2)}', svg_doc)
+            if to_pdf:
+                rosa_rain.cairosvg.svg2pdf(bytestring=new_svg_doc.encode('utf-8'))
+
+    return [
+        measure(f"csv_to_svg_table ({len(csv_files)} files)", lambda: render(False), repeat),
+        measure(f"csv_to_svg_table + svg2pdf ({len(csv_files)} files)", lambda: render(True), 1)
+    ]
+
+def main(folder_path: str, repeat: int, render_files: int, output: str):
+    """
+    Times ingestion, the resolvers for each filter the frontend uses, the
+    HTTP endpoints and the SVG/PDF rendering on the given results folder.
+    """
+    results = []
+    print(f"{'benchmark':<40} {'min ms':>10} {'median ms':>10} {'mean ms':>10}")
+
+    loaded = {}
+    results.append(measure('load_all_csvs (cold start)', lambda: loaded.update(df=app.load_all_csvs(folder_path)), 1))
+    df = loaded['df']
+    if df.empty:
+        print(f"Error: No results loaded from '{folder_path}'.")
+        return
+    results.append(measure('create_schema_from_df', lambda: app.create_schema_from_df(df), 1))
+    app.df = df
+    app.data_loaded_event.set()
+
+    # Polling places have 16-digit districtIds, fall back to any district otherwise
+    polling_places = df.loc[df['districtId'].str.len() == 16, 'districtId']
+    district_id = polling_places.iloc[0] if not polling_places.empty else df['districtId'].dropna().iloc[0]
+    wahlkreis_id = df['wahlkreisId'].iloc[0]
+    queries = [
+        ('allData(districtId)', DISTRICT_QUERY, {"districtId": district_id}),
+        ('allData(wahlkreisId)', WAHLKREIS_QUERY, {"wahlkreisId": wahlkreis_id}),
+        ('allData(Merkmal substring)', MERKMAL_QUERY, {"merkmal": "Weg"})
+    ]
+    results += asyncio.run(benchmark_requests(queries, repeat))
+
+    if render_files > 0:
+        results += benchmark_rendering(df, folder_path, render_files, repeat)
+
+    if output:
+        record = {
+            "commit": git_commit(),
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "folder": folder_path,
+            "files": int(df['sourceFile'].nunique()),
+            "rows": len(df),
+            "results": results
+        }
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        print(f"Results appended to '{output}'.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, queries and rendering.")
+    parser.add_argument('--folder', default='results', help="Results folder, e.g. one written by rosa-synth.py")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--render-files', type=int, default=10, help="Number of result files rendered to SVG/PDF")
+    parser.add_argument('--output', help="JSON lines file the results are appended to")
+    args = parser.parse_args()
+    main(args.folder, args.repeat, args.render_files, args.output)
@@ -0,0 +1,103 @@
+import argparse
+import gzip
+import json
+import os
+import time
+from graphene.utils.str_converters import to_camel_case
+from app import load_all_csvs
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Fields the frontend requests for the polling place and the wahlkreis popups
+DISTRICT_FIELDS = [
+    'Merkmal',
+    'Erststimmen_Anzahl',
+    'Erststimmen_Anteil',
+    'Erststimmen_Gewinn',
+    'Zweitstimmen_Anzahl',
+    'Zweitstimmen_Anteil',
+    'Zweitstimmen_Gewinn',
+    'districtId',
+    'wahlkreisId',
+    'sourceType',
+    'sourceFile'
+]
+WAHLKREIS_FIELDS = ['Merkmal', 'Erststimmen_Anzahl', 'Zweitstimmen_Anzahl', 'districtId']
+
+def to_bundle(rows, fields) -> dict:
+    """
+    Builds the same response body /graphql returns for an allData query,
+    using the schema's camelCase field names.
+    """
+    records = rows[fields].rename(columns=to_camel_case).to_dict('records')
+    return {"data": {"allData": records}}
+
+def write_bundle(path: str, payload) -> int:
+    """
+    Writes compact JSON next to its precompressed .gz (and .br, if brotli is
+    installed) variants. Returns the number of files written.
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(body)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is None:
+        return 2
+    with open(path + '.br', 'wb') as f:
+        f.write(brotli.compress(body, quality=11))
+    return 3
+
+def main(folder_path: str, locations_dir: str, output_dir: str):
+    """
+    Exports every per-district and per-wahlkreis allData response, the
+    polling place list and an index manifest as static files.
+    """
+    df = load_all_csvs(folder_path)
+    if df.empty:
+        print(f"Error: No results loaded from '{folder_path}'.")
+        return
+
+    for sub_dir in ('district', 'wahlkreis'):
+        os.makedirs(os.path.join(output_dir, sub_dir), exist_ok=True)
+
+    files_written = 0
+    manifest = {
+        "generated": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        "compression": ['gzip'] + (['br'] if brotli else []),
+        "districts": {},
+        "wahlkreise": {}
+    }
+
+    for district_id, rows in df.groupby('districtId', sort=True):
+        path = os.path.join(output_dir, 'district', f"{district_id}.json")
+        files_written += write_bundle(path, to_bundle(rows, DISTRICT_FIELDS))
+        manifest["districts"][district_id] = {
+            "locationName": rows['locationName'].iloc[0],
+            "wahlkreisId": rows['wahlkreisId'].iloc[0],
+            "rows": len(rows)
+        }
+
+    for wahlkreis_id, rows in df.groupby('wahlkreisId', sort=True):
+        path = os.path.join(output_dir, 'wahlkreis', f"{wahlkreis_id}.json")
+        files_written += write_bundle(path, to_bundle(rows, WAHLKREIS_FIELDS))
+        manifest["wahlkreise"][wahlkreis_id] = {"rows": len(rows)}
+
+    # Same list /api/polling-places returns
+    polling_place_ids = [os.path.splitext(f)[0] for f in os.listdir(locations_dir) if f.endswith('.csv')]
+    files_written += write_bundle(os.path.join(output_dir, 'polling-places.json'), polling_place_ids)
+
+    files_written += write_bundle(os.path.join(output_dir, 'index.json'), manifest)
+    print(f"Exported {len(manifest['districts'])} districts and {len(manifest['wahlkreise'])} wahlkreise "
+          f"({files_written} files) to '{output_dir}'.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export static JSON bundles of the election results.")
+    parser.add_argument('--folder', default='results')
+    parser.add_argument('--locations', default='static/data/locations')
+    parser.add_argument('--output', default='static/export')
+    args = parser.parse_args()
+    main(args.folder, args.locations, args.output)
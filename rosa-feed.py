@@ -0,0 +1,105 @@
+import argparse
+import csv
+import glob
+import io
+import os
+import random
+import time
+
+# Columns holding absolute vote counts in the scraped results CSVs
+COUNT_COLUMNS = [1, 4]
+
+def parse_count(value: str):
+    """
+    Parses a count as written by the scraper. Returns None for values that
+    are not counts.
+
+    Counts use a German thousands separator ('1.191'), and some were written
+    back as floats, either dropping trailing zeros of the thousands ('3.96'
+    for 3.960) or with a '.0' suffix ('547.0').
+    """
+    value = value.strip()
+    if value in ('', '-'):
+        return None
+    try:
+        if value.endswith('.0'):
+            return int(value[:-2].replace('.', ''))
+        if '.' in value:
+            integer, fraction = value.rsplit('.', 1)
+            if len(fraction) < 3:
+                fraction = fraction.ljust(3, '0')
+            return int(integer.replace('.', '') + fraction)
+        return int(value)
+    except ValueError:
+        return None
+
+def format_count(count: int) -> str:
+    # German thousands separator, as written by the scraper
+    return f"{count:,}".replace(',', '.')
+
+def scale_results(csv_text: str, fraction: float) -> str:
+    """
+    Returns the CSV with every vote count scaled down to the given fraction,
+    as if only that share of the ballots had been counted yet.
+    """
+    rows = list(csv.reader(io.StringIO(csv_text), delimiter=';'))
+    out = io.StringIO()
+    writer = csv.writer(out, delimiter=';', lineterminator='\n')
+    for index, row in enumerate(rows):
+        # Keep the header and the number of eligible voters untouched
+        if index > 0 and row and row[0] != 'Wahlberechtigte':
+            for col in COUNT_COLUMNS:
+                if col < len(row):
+                    count = parse_count(row[col])
+                    if count is not None:
+                        row[col] = format_count(int(count * fraction))
+        writer.writerow(row)
+    return out.getvalue()
+
+def write_atomic(path: str, content: str):
+    """
+    Replaces the file in one step so the app never reads a half-written file.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def main(folder_path: str, pattern: str, files: int, steps: int, interval: float):
+    """
+    Simulates an election night by rewriting result files with growing
+    vote counts. The original files are restored when the feed ends.
+    """
+    all_files = sorted(glob.glob(os.path.join(folder_path, pattern)))
+    if not all_files:
+        print(f"Error: No files matching '{pattern}' found in '{folder_path}'.")
+        return
+
+    selected = random.sample(all_files, min(files, len(all_files)))
+    originals = {}
+    for path in selected:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            originals[path] = f.read()
+
+    print(f"Simulating {steps} updates for {len(selected)} result files.")
+    try:
+        for step in range(1, steps + 1):
+            fraction = step / steps
+            for path, csv_text in originals.items():
+                write_atomic(path, scale_results(csv_text, fraction))
+            print(f"Step {step}/{steps}: {fraction:.0%} counted.")
+            time.sleep(interval)
+    finally:
+        for path, csv_text in originals.items():
+            write_atomic(path, csv_text)
+        print("Original result files restored.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated live feed rewriting files in the results folder.")
+    parser.add_argument('--folder', default='results')
+    parser.add_argument('--pattern', default='wahlkreis_*.csv', help="Glob pattern of the files to update")
+    parser.add_argument('--files', type=int, default=5, help="Number of result files to update")
+    parser.add_argument('--steps', type=int, default=10, help="Number of updates per file")
+    parser.add_argument('--interval', type=float, default=3, help="Seconds between updates")
+    args = parser.parse_args()
+    main(args.folder, args.pattern, args.files, args.steps, args.interval)
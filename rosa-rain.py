@@ -88,61 +88,65 @@ def csv_to_svg_table(csv_data, filename, svg_width=800):
 
     return svg_content
 
+# Layer of the SVG template the election table is rendered into
+TABLE_LAYER_PATTERN = re.compile(r'(<g\s+inkscape:groupmode="layer"\s+id="layer3"\s+inkscape:label="ElectionTable">).*?(</g>)', re.DOTALL)
+
 # The rest of your main script remains the same.
 # --- Main script ---
-directory = 'results'
-output_dir = 'output_svgs'
-pdf_output_dir = 'output_pdfs'
-svg_template_file = 'rr.svg'
-
-os.makedirs(output_dir, exist_ok=True)
-os.makedirs(pdf_output_dir, exist_ok=True)
-
-if not os.path.isdir(directory):
-    print(f"Error: The directory '{directory}' was not found.")
-else:
-    try:
-        with open(svg_template_file, 'r', encoding='utf-8') as f:
-            svg_doc = f.read()
-    except FileNotFoundError:
-        print(f"Error: The template file '{svg_template_file}' was not found.")
-        exit()
-
-    pattern = re.compile(r'(<g\s+inkscape:groupmode="layer"\s+id="layer3"\s+inkscape:label="ElectionTable">).*?(</g>)', re.DOTALL)
+if __name__ == "__main__":
+    directory = 'results'
+    output_dir = 'output_svgs'
+    pdf_output_dir = 'output_pdfs'
+    svg_template_file = 'rr.svg'
 
-    match = pattern.search(svg_doc)
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(pdf_output_dir, exist_ok=True)
 
-    if not match:
-        print("Fehler: Das angegebene SVG-Gruppen-Tag konnte nicht gefunden werden.")
+    if not os.path.isdir(directory):
+        print(f"Error: The directory '{directory}' was not found.")
     else:
-        for filename in os.listdir(directory):
-            if filename.endswith('.csv'):
-                csv_file_path = os.path.join(directory, filename)
-
-                try:
-                    with open(csv_file_path, 'r', encoding='utf-8') as f:
-                        csv_string = f.read()
-
-                    # Pass the filename to the function
-                    svg_table = csv_to_svg_table(csv_string, filename)
-                    start_group = match.group(1)
-                    end_group = match.group(2)
-                    new_group_content = f'{start_group}\n{svg_table}\n{end_group}'
-                    new_svg_doc = pattern.sub(new_group_content, svg_doc)
-                    output_filename = os.path.splitext(filename)[0]
-
-                    # --- SVG Output ---
-                    svg_output_path = os.path.join(output_dir, output_filename + '.svg')
-                    with open(svg_output_path, 'w', encoding='utf-8') as f:
-                        f.write(new_svg_doc)
-                    print(f"SVG-Datei '{svg_output_path}' erfolgreich erstellt!")
-
-                    # --- PDF Output ---
-                    pdf_output_path = os.path.join(pdf_output_dir, output_filename + '.pdf')
-                    cairosvg.svg2pdf(bytestring=new_svg_doc.encode('utf-8'), write_to=pdf_output_path)
-                    print(f"PDF-Datei '{pdf_output_path}' erfolgreich erstellt!")
-
-                except FileNotFoundError:
-                    print(f"Fehler: Die Datei '{csv_file_path}' wurde nicht gefunden.")
-                except Exception as e:
-                    print(f"Ein unerwarteter Fehler ist bei der Verarbeitung von '{filename}' aufgetreten: {e}")
+        try:
+            with open(svg_template_file, 'r', encoding='utf-8') as f:
+                svg_doc = f.read()
+        except FileNotFoundError:
+            print(f"Error: The template file '{svg_template_file}' was not found.")
+            exit()
+
+        pattern = TABLE_LAYER_PATTERN
+
+        match = pattern.search(svg_doc)
+
+        if not match:
+            print("Fehler: Das angegebene SVG-Gruppen-Tag konnte nicht gefunden werden.")
+        else:
+            for filename in os.listdir(directory):
+                if filename.endswith('.csv'):
+                    csv_file_path = os.path.join(directory, filename)
+
+                    try:
+                        with open(csv_file_path, 'r', encoding='utf-8') as f:
+                            csv_string = f.read()
+
+                        # Pass the filename to the function
+                        svg_table = csv_to_svg_table(csv_string, filename)
+                        start_group = match.group(1)
+                        end_group = match.group(2)
+                        new_group_content = f'{start_group}\n{svg_table}\n{end_group}'
+                        new_svg_doc = pattern.sub(new_group_content, svg_doc)
+                        output_filename = os.path.splitext(filename)[0]
+
+                        # --- SVG Output ---
+                        svg_output_path = os.path.join(output_dir, output_filename + '.svg')
+                        with open(svg_output_path, 'w', encoding='utf-8') as f:
+                            f.write(new_svg_doc)
+                        print(f"SVG-Datei '{svg_output_path}' erfolgreich erstellt!")
+
+                        # --- PDF Output ---
+                        pdf_output_path = os.path.join(pdf_output_dir, output_filename + '.pdf')
+                        cairosvg.svg2pdf(bytestring=new_svg_doc.encode('utf-8'), write_to=pdf_output_path)
+                        print(f"PDF-Datei '{pdf_output_path}' erfolgreich erstellt!")
+
+                    except FileNotFoundError:
+                        print(f"Fehler: Die Datei '{csv_file_path}' wurde nicht gefunden.")
+                    except Exception as e:
+                        print(f"Ein unerwarteter Fehler ist bei der Verarbeitung von '{filename}' aufgetreten: {e}")
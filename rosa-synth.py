@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import random
+
+HEADER = 'Merkmal_Unnamed: 0_level_1;Erststimmen_Anzahl;Erststimmen_Anteil;Erststimmen_Gewinn;Zweitstimmen_Anzahl;Zweitstimmen_Anteil;Zweitstimmen_Gewinn'
+
+# Parties of the 2024 Brandenburg ballot, the first ones also had direct candidates
+PARTIES = [
+    'SPD', 'AfD', 'CDU', 'GRÜNE/B 90', 'DIE LINKE', 'BVB / FREIE WÄHLER', 'FDP',
+    'Tierschutzpartei', 'Plus', 'BSW', 'III. Weg', 'DKP', 'DLW', 'WU'
+]
+DIRECT_CANDIDATE_PARTIES = {'SPD', 'AfD', 'CDU', 'GRÜNE/B 90', 'DIE LINKE', 'BVB / FREIE WÄHLER', 'FDP', 'III. Weg'}
+
+# Population in millions and official state code (AGS) of each region in deutschland_geo.json
+STATES = {
+    'Schleswig-Holstein': (2.95, '01'),
+    'Hamburg': (1.89, '02'),
+    'Niedersachsen': (8.14, '03'),
+    'Bremen': (0.69, '04'),
+    'Nordrhein-Westfalen': (18.14, '05'),
+    'Hessen': (6.39, '06'),
+    'Rheinland-Pfalz': (4.16, '07'),
+    'Baden-Württemberg': (11.28, '08'),
+    'Bayern': (13.37, '09'),
+    'Saarland': (0.99, '10'),
+    'Berlin': (3.76, '11'),
+    'Brandenburg': (2.57, '12'),
+    'Mecklenburg-Vorpommern': (1.63, '13'),
+    'Sachsen': (4.09, '14'),
+    'Sachsen-Anhalt': (2.19, '15'),
+    'Thüringen': (2.13, '16')
+}
+
+# Share of scraped files whose Zweitstimmen_Anzahl column was written as floats (937 of 4427)
+FLOAT_COUNT_SHARE = 0.21
+
+# Files per wahlkreis in the scraped Brandenburg results
+BRANDENBURG_WAHLKREISE = 44
+FILES_PER_WAHLKREIS = {'amt': 50 / 44, 'gemeinde': 415 / 44, 'stimmbezirk': 3229 / 44, 'briefwahlbezirk': 687 / 44}
+
+def format_count(count: int) -> str:
+    # German thousands separator, as on the official results pages
+    return f"{count:,}".replace(',', '.')
+
+def format_float_count(count: int) -> str:
+    # The scraper read the whole column as floats, so '3.960' became 3.96 and '547' became 547.0
+    return repr(count / 1000) if count >= 1000 else repr(float(count))
+
+def format_share(count: int, total: int) -> str:
+    share = 100 * count / total if total else 0
+    return f"{share:.1f} %".replace('.', ',')
+
+def format_gain(rng: random.Random, with_gain: bool) -> str:
+    if not with_gain:
+        return '-'
+    gain = rng.randint(-150, 150)
+    return f"{gain:+03d}" if gain else '00'
+
+def results_csv(rng: random.Random, eligible: int, with_gain: bool) -> str:
+    """
+    Returns one results table in the format rosa-vote.py writes, including
+    the files whose Zweitstimmen_Anzahl column came out as floats.
+    """
+    second_count = format_float_count if rng.random() < FLOAT_COUNT_SHARE else format_count
+    voters = int(eligible * rng.uniform(0.55, 0.8))
+    lines = [HEADER, f"Wahlberechtigte;{format_count(eligible)};-;-;{second_count(eligible)};-;-"]
+
+    votes = {}
+    for column in ('Erststimmen', 'Zweitstimmen'):
+        invalid = int(voters * rng.uniform(0.005, 0.025))
+        valid = voters - invalid
+        parties = [p for p in PARTIES if column == 'Zweitstimmen' or p in DIRECT_CANDIDATE_PARTIES]
+        weights = [rng.random() ** 2 for _ in parties]
+        counts = {p: int(valid * w / sum(weights)) for p, w in zip(parties, weights)}
+        votes[column] = (invalid, sum(counts.values()), counts)
+
+    erst_invalid, erst_valid, erst = votes['Erststimmen']
+    zweit_invalid, zweit_valid, zweit = votes['Zweitstimmen']
+    lines.append(f"Wählende;{format_count(voters)};{format_share(voters, eligible)};{format_gain(rng, with_gain)};"
+                 f"{second_count(voters)};{format_share(voters, eligible)};{format_gain(rng, with_gain)}")
+    lines.append(f"Ungültige Stimmen;{format_count(erst_invalid)};{format_share(erst_invalid, voters)};{format_gain(rng, with_gain)};"
+                 f"{second_count(zweit_invalid)};{format_share(zweit_invalid, voters)};{format_gain(rng, with_gain)}")
+    lines.append(f"Gültige Stimmen;{format_count(erst_valid)};{format_share(erst_valid, voters)};{format_gain(rng, with_gain)};"
+                 f"{second_count(zweit_valid)};{format_share(zweit_valid, voters)};{format_gain(rng, with_gain)}")
+
+    for party in PARTIES:
+        if party in erst:
+            first = f"{format_count(erst[party])};{format_share(erst[party], erst_valid)};{format_gain(rng, with_gain)}"
+        else:
+            first = '-;-;-'
+        second = f"{second_count(zweit[party])};{format_share(zweit[party], zweit_valid)};{format_gain(rng, with_gain)}"
+        lines.append(f"{party};{first};{second}")
+    return '\n'.join(lines) + '\n'
+
+def write_file(output_dir: str, name: str, content: str):
+    with open(os.path.join(output_dir, name + '.csv'), 'w', encoding='utf-8') as f:
+        f.write(content)
+
+def generate_state(rng: random.Random, output_dir: str, state: str, first_wahlkreis: int, scale: float) -> int:
+    """
+    Writes the result files of one state, sized by its population relative
+    to Brandenburg. Returns the number of wahlkreise generated.
+    """
+    population, state_code = STATES[state]
+    wahlkreise = max(1, round(BRANDENBURG_WAHLKREISE * population / STATES['Brandenburg'][0] * scale))
+    slug = state.replace(' ', '_')
+
+    for offset in range(wahlkreise):
+        number = first_wahlkreis + offset
+        wk = f"{number:02d}"
+        kreis = f"{number % 1000:03d}"
+        stimmbezirke = []
+        for _ in range(round(FILES_PER_WAHLKREIS['stimmbezirk'])):
+            stimmbezirke.append(rng.randint(150, 1500))
+
+        write_file(output_dir, f"wahlkreis_{wk}_{wk}_{wk}_-_{slug}_{offset + 1}",
+                   results_csv(rng, sum(stimmbezirke), True))
+
+        for i in range(1, round(FILES_PER_WAHLKREIS['amt']) + 1):
+            amt_id = f"{state_code}{kreis}{i:04d}"
+            write_file(output_dir, f"amt_{wk}_{amt_id}_{kreis}_{i:02d}_-_Amt_{slug}_{number}_{i}",
+                       results_csv(rng, rng.randint(5000, 15000), True))
+
+        gemeinden = round(FILES_PER_WAHLKREIS['gemeinde'])
+        for i in range(1, gemeinden + 1):
+            gemeinde_id = f"{state_code}{kreis}{i:04d}{i:03d}"
+            write_file(output_dir, f"gemeinde_{wk}_{gemeinde_id}_{kreis}_{i:04d}_{i:03d}_-_Gemeinde_{slug}_{number}_{i}",
+                       results_csv(rng, rng.randint(1000, 30000), True))
+
+        for i, eligible in enumerate(stimmbezirke, start=1):
+            gemeinde = (i - 1) % gemeinden + 1
+            bezirk_id = f"{state_code}{kreis}{gemeinde:04d}{gemeinde:03d}{i:04d}"
+            write_file(output_dir, f"stimmbezirk_{wk}_{bezirk_id}_{i:04d}_-_Gemeinde_{slug}_{number}_{gemeinde}_{i:02d}",
+                       results_csv(rng, eligible, False))
+
+        for i in range(1, round(FILES_PER_WAHLKREIS['briefwahlbezirk']) + 1):
+            gemeinde = (i - 1) % gemeinden + 1
+            bezirk_id = f"{state_code}{kreis}{gemeinde:04d}{gemeinde:03d}{9000 + i}"
+            write_file(output_dir, f"briefwahlbezirk_{wk}_{bezirk_id}_{9000 + i}_-_Gemeinde_{slug}_{number}_{gemeinde}_Briefwahl",
+                       results_csv(rng, rng.randint(200, 2000), False))
+
+    return wahlkreise
+
+def load_states(geo_json_path: str) -> list:
+    with open(geo_json_path, 'r', encoding='utf-8') as f:
+        geo = json.load(f)
+    return [feature['properties']['name'] for feature in geo['features']]
+
+def main(output_dir: str, states: list, scale: float, seed: int):
+    """
+    Synthesizes results CSVs for the given states, Brandenburg first, so that
+    a growing number of states gives a scaling curve up to all of Germany.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    next_wahlkreis = 1
+    for state in states:
+        count = generate_state(rng, output_dir, state, next_wahlkreis, scale)
+        print(f"{state}: {count} wahlkreise")
+        next_wahlkreis += count
+    print(f"Generated {len(os.listdir(output_dir))} result files in '{output_dir}'.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic election results in the scraper's CSV format.")
+    parser.add_argument('--output', default='synthetic_results')
+    parser.add_argument('--states', type=int, default=1, help="Number of states, starting with Brandenburg (max. 16)")
+    parser.add_argument('--scale', type=float, default=1.0, help="Size factor applied to every state")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--geojson', default='static/data/deutschland_geo.json')
+    args = parser.parse_args()
+
+    regions = load_states(args.geojson)
+    ordered = ['Brandenburg'] + sorted(r for r in regions if r != 'Brandenburg' and r in STATES)
+    main(args.output, ordered[:args.states], args.scale, args.seed)
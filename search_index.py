@@ -0,0 +1,145 @@
+import bisect
+import re
+import unicodedata
+import pandas as pd
+
+MIN_FUZZY_SCORE = 0.2
+# Suggestions return at most this many districtIds, districtCount has the full number
+MAX_DISTRICT_IDS = 50
+# Ranked matches precomputed for prefixes up to this length, which match too many keys to score per keystroke
+SHORT_PREFIX_LENGTH = 2
+SHORT_PREFIX_LIMIT = 50
+# Summary rows of every results table, not parties
+SUMMARY_ROWS = {'Wahlberechtigte', 'Wählende', 'Ungültige Stimmen', 'Gültige Stimmen'}
+
+def normalize(text: str) -> str:
+    """
+    Lowercases the text and strips accents, so 'Brück' and 'bruck' match.
+    """
+    decomposed = unicodedata.normalize('NFKD', str(text).casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', stripped).strip()
+
+def strip_id_prefix(name: str) -> str:
+    """
+    Removes the numeric id prefix of location names ('8014 - Wittstock 14 Gadow').
+    """
+    return re.sub(r'^[\d ]+- ', '', name)
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """
+    In-memory type-ahead index over the distinct location names and parties.
+    Prefix matches come from a sorted array of names and their words,
+    fuzzy matches from a trigram index.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.entries = []
+        if not df.empty and 'locationName' in df.columns:
+            for name, ids in df.groupby('locationName', sort=True)['districtId'].unique().items():
+                self.entries.append((name, 'location', sorted(i for i in ids if i is not None)))
+        if not df.empty and 'Merkmal' in df.columns:
+            # A party's districts are the ones where it received any votes
+            voted = df[((df['Erststimmen_Anzahl'] > 0) | (df['Zweitstimmen_Anzahl'] > 0))
+                       & ~df['Merkmal'].isin(SUMMARY_ROWS)]
+            for name, ids in voted.groupby('Merkmal', sort=True)['districtId'].unique().items():
+                self.entries.append((name, 'party', sorted(i for i in ids if i is not None)))
+
+        self.normalized = [normalize(label) for label, _, _ in self.entries]
+        self.names = [strip_id_prefix(name) for name in self.normalized]
+
+        # Sorted (key, entry, is_full_name) triples for bisecting on a prefix
+        prefixes = []
+        for index, (full, name) in enumerate(zip(self.normalized, self.names)):
+            prefixes.append((full, index, True))
+            if name != full:
+                prefixes.append((name, index, True))
+            for word in name.split(' ')[1:]:
+                prefixes.append((word, index, False))
+        prefixes.sort()
+        self.prefix_keys = [key for key, _, _ in prefixes]
+        self.prefix_entries = [(index, is_full) for _, index, is_full in prefixes]
+
+        self.trigram_index = {}
+        self.trigram_counts = []
+        for index, name in enumerate(self.names):
+            grams = trigrams(name)
+            self.trigram_counts.append(len(grams))
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(index)
+
+        self.short_prefixes = {}
+        for key in set(self.prefix_keys):
+            for length in range(1, min(SHORT_PREFIX_LENGTH, len(key)) + 1):
+                prefix = key[:length]
+                if prefix not in self.short_prefixes:
+                    self.short_prefixes[prefix] = self.rank(self.prefix_matches(prefix))[:SHORT_PREFIX_LIMIT]
+
+    def prefix_matches(self, term: str) -> dict:
+        scores = {}
+        start = bisect.bisect_left(self.prefix_keys, term)
+        for position in range(start, len(self.prefix_keys)):
+            if not self.prefix_keys[position].startswith(term):
+                break
+            index, is_full = self.prefix_entries[position]
+            if term in (self.normalized[index], self.names[index]):
+                score = 3.0
+            elif is_full:
+                score = 2.0
+            else:
+                score = 1.5
+            # Prefer shorter names, they are closer to what was typed
+            score += len(term) / max(len(self.names[index]), len(term))
+            scores[index] = max(scores.get(index, 0), score)
+        return scores
+
+    def fuzzy_matches(self, term: str) -> dict:
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for index in self.trigram_index.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+
+        scores = {}
+        for index, count in shared.items():
+            similarity = count / (len(grams) + self.trigram_counts[index] - count)
+            if similarity >= MIN_FUZZY_SCORE:
+                scores[index] = similarity
+        return scores
+
+    def search(self, term: str, limit: int = 10) -> list:
+        """
+        Returns up to `limit` suggestions ranked by exact, prefix, word prefix
+        and finally trigram similarity.
+        """
+        term = normalize(term)
+        if not term or limit <= 0:
+            return []
+
+        if len(term) <= SHORT_PREFIX_LENGTH and limit <= SHORT_PREFIX_LIMIT:
+            ranked = self.short_prefixes.get(term, [])[:limit]
+        else:
+            scores = self.prefix_matches(term)
+            if len(scores) < limit and len(term) >= 3:
+                for index, score in self.fuzzy_matches(term).items():
+                    scores.setdefault(index, score)
+            ranked = self.rank(scores)[:limit]
+
+        suggestions = []
+        for index, score in ranked:
+            label, kind, district_ids = self.entries[index]
+            suggestions.append({
+                "label": label,
+                "kind": kind,
+                "score": round(score, 4),
+                "districtIds": district_ids[:MAX_DISTRICT_IDS],
+                "districtCount": len(district_ids)
+            })
+        return suggestions
+
+    def rank(self, scores: dict) -> list:
+        return sorted(scores.items(), key=lambda item: (-item[1], self.normalized[item[0]]))
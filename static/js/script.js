@@ -48,6 +48,28 @@ function getColor(d) {
     return colors[index];
 }
 
+function useStaticBundles() {
+    return Boolean(window.APP_CONFIG && window.APP_CONFIG.useStaticBundles);
+}
+
+// Fetches an allData response from /graphql or, with static bundles enabled,
+// from the JSON files exported by rosa-export.py.
+async function fetchAllData(bundlePath, query, variables) {
+    if (useStaticBundles()) {
+        const response = await fetch(window.STATIC_PATHS.exportData + bundlePath);
+        if (response.status === 404) {
+            return { data: { allData: [] } };
+        }
+        return response.json();
+    }
+    const response = await fetch('/graphql', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ query, variables })
+    });
+    return response.json();
+}
+
 async function searchData() {
     const keyword = dom.searchInput.value;
     const resultsContainer = dom.resultsPre;
@@ -58,10 +80,13 @@ async function searchData() {
         resultsContainer.textContent = "Error: Invalid threshold value. Please enter a number after '>' (e.g., 'AfD > 100').";
         return;
     }
+    // A picked location suggestion searches by place, anything else by party
+    const byLocation = locationSuggestions.has(merkmal);
     const query = `
-    query GetData($merkmal: String) {
+    query GetData($merkmal: String, $locationName: String) {
         allData(
             Merkmal: $merkmal
+            locationName: $locationName
         ) {
             Merkmal
             ErststimmenAnzahl
@@ -73,7 +98,10 @@ async function searchData() {
         }
     }
     `;
-    const variables = { merkmal };
+    // allData filters with an unanchored regular expression, so match the whole location name literally
+    const variables = byLocation
+        ? { locationName: `^${merkmal.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}$` }
+        : { merkmal };
     resultsContainer.innerHTML = '<span style="color: #007BFF;">Loading...</span>';
     try {
         const response = await fetch('/graphql', {
@@ -86,8 +114,9 @@ async function searchData() {
         if (data.errors && data.errors.length) {
             resultsContainer.textContent = "GraphQL error: " + data.errors.map(e => e.message).join('; ');
         } else if (data.data && data.data.allData && Array.isArray(data.data.allData)) {
-            // First, filter to get only items with a valid 16-digit districtId
-            let validDistrictData = data.data.allData.filter(item => {
+            // First, filter to get only items with a valid 16-digit districtId;
+            // a picked location can also be an amt, gemeinde or wahlkreis table
+            let validDistrictData = byLocation ? data.data.allData : data.data.allData.filter(item => {
                 return typeof item.districtId === 'string' && /^\d{16}$/.test(item.districtId);
             });
             // Then, apply the threshold filter to the valid data
@@ -98,7 +127,9 @@ async function searchData() {
             });
             filteredData.sort((a, b) => (parseInt(b.ZweitstimmenAnzahl, 10) || 0) - (parseInt(a.ZweitstimmenAnzahl, 10) || 0));
             if (filteredData.length === 0) {
-                resultsContainer.textContent = `No results found for '${merkmal}' with more than ${threshold} votes and a valid 16-digit districtId.`;
+                resultsContainer.textContent = byLocation
+                    ? `No results found for '${merkmal}' with more than ${threshold} votes.`
+                    : `No results found for '${merkmal}' with more than ${threshold} votes and a valid 16-digit districtId.`;
             } else {
                 resultsContainer.innerHTML = '';
                 pollingPlaceIdsToShow = filteredData.map(item => item.districtId);
@@ -127,6 +158,51 @@ async function searchData() {
     }
 }
 
+let suggestTimeout = null;
+let locationSuggestions = new Set();
+
+// Type-ahead: fills the search box's datalist from the search index
+function suggestSearchTerms() {
+    clearTimeout(suggestTimeout);
+    suggestTimeout = setTimeout(async () => {
+        const term = dom.searchInput.value.split('>')[0].trim();
+        if (term.length < 2 || !dom.searchSuggestions) {
+            return;
+        }
+        const query = `
+        query Suggest($term: String!) {
+            search(term: $term, limit: 10) {
+                label
+                kind
+            }
+        }
+        `;
+        try {
+            const response = await fetch('/graphql', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ query, variables: { term } })
+            });
+            const data = await response.json();
+            if (!data.data || !Array.isArray(data.data.search)) {
+                return;
+            }
+            dom.searchSuggestions.innerHTML = '';
+            locationSuggestions = new Set(
+                data.data.search.filter(s => s.kind === 'location').map(s => s.label)
+            );
+            data.data.search.forEach(suggestion => {
+                const option = document.createElement('option');
+                option.value = suggestion.label;
+                option.label = suggestion.kind;
+                dom.searchSuggestions.appendChild(option);
+            });
+        } catch (error) {
+            console.error('Search suggestions failed:', error);
+        }
+    }, 150);
+}
+
 window.highlightDistrict = (districtId) => {
     // Get the actual L.geoJSON layer from the layer group
     const geoJSON = geojsonLayer.getLayers()[0];
@@ -155,7 +231,9 @@ window.resetHighlight = () => {
 async function loadAllPollingPlaceData() {
     let pollingPlaceIds = [];
     try {
-        const response = await fetch('/api/polling-places');
+        const response = useStaticBundles()
+            ? await fetch(window.STATIC_PATHS.exportData + 'polling-places.json')
+            : await fetch('/api/polling-places');
         if (response.ok) {
             pollingPlaceIds = await response.json();
         } else {
@@ -236,12 +314,7 @@ function showAllPollingPlaceMarkers(idsToDisplay = null) {
             `;
             const variables = { districtId: data.id };
             try {
-                const response = await fetch('/graphql', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ query, variables })
-                });
-                const graphqlData = await response.json();
+                const graphqlData = await fetchAllData(`district/${data.id}.json`, query, variables);
                 let popupHtml = `<b>${data.name}</b><br>ID: ${data.id}<br><br>`;
                 if (graphqlData.errors && graphqlData.errors.length) {
                     popupHtml += "Error: " + graphqlData.errors[0].message;
@@ -327,12 +400,7 @@ async function loadGeoJSON() {
                     layer.on('popupopen', async function () {
                         const variables = { wahlkreisId };
                         try {
-                            const response = await fetch('/graphql', {
-                                method: 'POST',
-                                headers: { 'Content-Type': 'application/json' },
-                                body: JSON.stringify({ query: mainDistrictQuery, variables })
-                            });
-                            const graphqlData = await response.json();
+                            const graphqlData = await fetchAllData(`wahlkreis/${wahlkreisId}.json`, mainDistrictQuery, variables);
 
                             let popupHtml = `<b>${feature.properties.name}</b><br>Wahlkreis: ${wahlkreisId}<br><br>`;
 
@@ -516,6 +584,7 @@ document.addEventListener('DOMContentLoaded', () => {
         input.addEventListener('keydown', e => {
             if (e.key === 'Enter') searchData();
         });
+        input.addEventListener('input', suggestSearchTerms);
     }
     if (button) button.addEventListener('click', searchData);
 });
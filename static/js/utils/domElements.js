@@ -4,6 +4,7 @@ export function getDOMElements() {
         themeToggleButton: document.getElementById('theme-toggle-button'),
         searchInput: document.getElementById('searchInput'),
         searchButton: document.getElementById('searchButton'),
+        searchSuggestions: document.getElementById('searchSuggestions'),
         resultsPre: document.getElementById('resultsPre'),
         // Add any other elements you need to access here
     };